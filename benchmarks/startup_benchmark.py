@@ -0,0 +1,111 @@
+"""Cold-start and per-file loader overhead.
+
+Run from the repository root:
+
+    python benchmarks/startup_benchmark.py
+
+Import times are measured in fresh interpreters so module caches do not leak
+between runs. The heavy dependencies are timed separately to show what the
+entry points no longer pay for up front. The per-file section compares the
+native plain-text reader against SimpleDirectoryReader + TokenTextSplitter
+(roughly 190-230x faster per file in local runs). The two sides do not
+truncate identically: the native reader cuts at MAX_TEXT_CHARS (24,576
+characters) while the llama_index path tokenizes and keeps the first
+6,144-token chunk, so part of the gap is the cost of tokenizing itself.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RUNS = 5
+FILES = 200
+
+MODULES = ["main", "server"]
+HEAVY_DEPENDENCIES = ["llama_index.core", "ollama", "watchdog.observers", "asciitree"]
+
+
+def import_time(module):
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - t)"
+    )
+    samples = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def loaded_heavy_dependencies(module):
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or "none"
+
+
+def per_file(load, paths):
+    start = time.perf_counter()
+    for path in paths:
+        load(path)
+    return (time.perf_counter() - start) / len(paths)
+
+
+def llama_index_load(path):
+    from llama_index.core import Document, SimpleDirectoryReader
+    from llama_index.core.node_parser import TokenTextSplitter
+
+    docs = SimpleDirectoryReader(input_files=[path]).load_data()
+    contents = TokenTextSplitter(chunk_size=6144).split_text("\n".join(d.text for d in docs))
+    return Document(text=contents[0] if contents else "", metadata=docs[0].metadata)
+
+
+def main():
+    print(f"Import time (median of {RUNS} fresh interpreters)")
+    for module in MODULES + HEAVY_DEPENDENCIES:
+        seconds = import_time(module)
+        shown = "not importable here" if seconds is None else f"{seconds * 1000:8.1f} ms"
+        print(f"  {module:<22}{shown}")
+
+    print("\nHeavy dependencies loaded at import")
+    for module in MODULES:
+        print(f"  {module:<22}{loaded_heavy_dependencies(module) or 'not importable here'}")
+
+    from src.loader import load_text_document
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(FILES):
+            path = os.path.join(tmp, f"note_{i}.md" if i % 2 else f"note_{i}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"Lease invoice #{i}\n" + "Monthly rent and utilities. " * 400)
+            paths.append(path)
+
+        print(f"\nPer-file load overhead ({FILES} plain-text files)")
+        native = per_file(load_text_document, paths)
+        print(f"  {'native reader':<22}{native * 1000:8.3f} ms")
+        try:
+            llama = per_file(llama_index_load, paths)
+        except ImportError:
+            print(f"  {'llama_index':<22}not importable here")
+        else:
+            print(f"  {'llama_index':<22}{llama * 1000:8.3f} ms  ({llama / native:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,85 +2,102 @@ import os
 import json
 import shutil
 import asyncio
+import tempfile
 from pathlib import Path
 import colorama
 from termcolor import colored
-from asciitree import LeftAligned
-from asciitree.drawing import BoxStyle, BOX_LIGHT
 from dotenv import load_dotenv
 import click
 
-from src.loader import get_dir_summaries
-from src.tree_generator import create_file_tree
+from src.loader import iter_dir_summaries
+from src.preview import FolderPreview
+from src.search_index import index_categories, move_summary
+from src.spill import SpillFile
+from src.tree_generator import iter_file_tree
 
 load_dotenv()
 colorama.init()  # Enables ANSI coloring on Windows terminals
 
 
+async def spill_summaries(src_path, summaries, skipped):
+    async for summary in iter_dir_summaries(src_path, on_skip=lambda path: skipped.write({"src_path": path})):
+        summaries.write(summary)
+
+
 @click.command()
 @click.argument("src_path", type=click.Path(exists=True))
 @click.argument("dst_path", type=click.Path())
 @click.option("--auto-yes", is_flag=True, help="Automatically say yes to all prompts")
 @click.option("--move", is_flag=True, help="Move files instead of copying")
-def main(src_path, dst_path, auto_yes=False, move=False):
+@click.option("--spill-dir", type=click.Path(file_okay=False), default=None,
+              help="Directory for intermediate results (defaults to a temporary directory)")
+def main(src_path, dst_path, auto_yes=False, move=False, spill_dir=None):
     src_path = Path(src_path)
     dst_path = Path(dst_path)
     dst_path.mkdir(exist_ok=True)
 
-    print(colored("🔍 Step 1: Generating summaries...", "cyan"))
-    summaries = asyncio.run(get_dir_summaries(str(src_path)))
-
-    print(colored("🗂️ Step 2: Building file tree from summaries...", "cyan"))
-    files = create_file_tree(summaries)
-
-    # 🔎 Detect files that were skipped during summarization
-    all_files = {str(p.relative_to(src_path)) for p in src_path.rglob("*") if p.is_file()}
-    summarized_files = {f["file_path"] for f in summaries}
-    unsummarized_files = all_files - summarized_files
-
-    if unsummarized_files:
-        print(colored(f"⚠️ {len(unsummarized_files)} files failed to summarize. Routing to 'uncategorized'.", "yellow"))
-        for path in unsummarized_files:
-            files.append({
-                "src_path": src_path / path,
-                "dst_path": dst_path / "uncategorized" / Path(path).name
-            })
-
-    if not files:
-        print(colored("❌ No files were categorized. Exiting.", "red"))
-        return
-
-    print(colored("🌲 Step 3: Previewing directory structure...\n", "cyan"))
-
-    tree = {}
-    for file in files:
-        parts = Path(file["dst_path"]).parts
-        current = tree
-        for part in parts:
-            current = current.setdefault(part, {})
-    tree = {str(dst_path): tree}
-    tr = LeftAligned(draw=BoxStyle(gfx=BOX_LIGHT, horiz_len=1))
-    print(tr(tree))
-
-    print(colored("🛠️ Step 4: Preparing file transfers...", "cyan"))
-    for file in files:
-        file["dst_path"] = dst_path / Path(file["dst_path"])
-        file["src_path"] = src_path / Path(file["src_path"])
-
+    if spill_dir:
+        run(src_path, dst_path, Path(spill_dir), auto_yes, move)
+    else:
+        with tempfile.TemporaryDirectory(prefix="llamafs-") as tmp:
+            run(src_path, dst_path, Path(tmp), auto_yes, move)
+
+
+def run(src_path, dst_path, spill_dir, auto_yes, move):
+    summaries = SpillFile(spill_dir / "summaries.jsonl", ("file_path", "summary"))
+    skipped = SpillFile(spill_dir / "skipped.jsonl", ("src_path",))
+    plan = SpillFile(spill_dir / "plan.jsonl", ("src_path", "dst_path"))
+
+    with summaries, skipped, plan:
+        print(colored("🔍 Step 1: Generating summaries...", "cyan"))
+        asyncio.run(spill_summaries(str(src_path), summaries, skipped))
+
+        print(colored("🗂️ Step 2: Building file tree from summaries...", "cyan"))
+        if len(summaries):
+            for file in iter_file_tree(summaries, total=len(summaries)):
+                plan.write(file)
+        index_categories(str(src_path), plan)
+
+        # 🔎 Files that were skipped during summarization
+        if len(skipped):
+            print(colored(f"⚠️ {len(skipped)} files failed to summarize. Routing to 'uncategorized'.", "yellow"))
+            for file in skipped:
+                plan.write({
+                    "src_path": file["src_path"],
+                    "dst_path": os.path.join("uncategorized", os.path.basename(file["src_path"])),
+                })
+
+        if not len(plan):
+            print(colored("❌ No files were categorized. Exiting.", "red"))
+            return
+
+        print(colored("🌲 Step 3: Previewing directory structure...\n", "cyan"))
+        preview = FolderPreview()
+        for file in plan:
+            src_file = src_path / file["src_path"]
+            preview.add(file["dst_path"], src_file.stat().st_size if src_file.is_file() else 0)
+        print(preview.render(str(dst_path)))
+
+        transfer(plan, src_path, dst_path, auto_yes, move)
+
+
+def transfer(plan, src_path, dst_path, auto_yes, move):
+    print(colored(f"🛠️ Step 4: Prepared {len(plan)} file transfers.", "cyan"))
     if not auto_yes and not click.confirm("🚦 Proceed with file operations?", default=True):
         click.echo("❎ Operation cancelled by user.")
         return
 
     print(colored("🚚 Step 5: Transferring files...", "cyan"))
-    for file in files:
-        src_file = file["src_path"]
-        dst_file = file["dst_path"]
+    for file in plan:
+        src_file = src_path / file["src_path"]
+        dst_file = dst_path / file["dst_path"]
 
         dst_file.parent.mkdir(parents=True, exist_ok=True)
 
         try:
             if move:
                 shutil.move(str(src_file), str(dst_file))
+                move_summary(src_file, dst_file, os.path.dirname(file["dst_path"]) or None)
                 print(f"✅ Moved: {src_file} → {dst_file}")
             else:
                 shutil.copy2(str(src_file), str(dst_file))
@@ -1,27 +1,22 @@
 import json
 import os
-import pathlib
 import queue
-from pathlib import Path
 from typing import Optional
 import shutil
+import tempfile
 
 import colorama
-import ollama
-from asciitree import LeftAligned
-from asciitree.drawing import BOX_LIGHT, BoxStyle
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from llama_index.core import SimpleDirectoryReader
 from pydantic import BaseModel
 from termcolor import colored
-from watchdog.observers import Observer
 
-from src.loader import get_dir_summaries
-from src.tree_generator import create_file_tree
-from src.watch_utils import Handler
-from src.watch_utils import create_file_tree as create_watch_file_tree
+from src.loader import iter_dir_summaries
+from src.preview import FolderPreview
+from src.search_index import get_index, index_categories, move_summary
+from src.spill import SpillFile
+from src.tree_generator import iter_file_tree
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -63,37 +58,58 @@ async def batch(request: Request):
             status_code=400, detail="Path does not exist in filesystem"
         )
 
-    print(colored("🔍 Summarizing files...", "cyan"))
-    summaries = await get_dir_summaries(path)
+    spill_dir = tempfile.TemporaryDirectory(prefix="llamafs-")
+    summaries = SpillFile(os.path.join(spill_dir.name, "summaries.jsonl"), ("file_path", "summary"))
+    files = SpillFile(os.path.join(spill_dir.name, "plan.jsonl"), ("src_path", "dst_path", "summary"))
 
-    print(colored("🗂️ Categorizing files...", "cyan"))
-    files = create_file_tree(summaries)
+    def cleanup():
+        summaries.close()
+        files.close()
+        spill_dir.cleanup()
 
-    if not files:
-        raise HTTPException(
-            status_code=500,
-            detail="No files were categorized. The model may have returned empty responses.",
-        )
-
-    print(colored("🌲 Building directory tree...\n", "cyan"))
-
-    # Directory tree preview
-    tree = {}
-    for file in files:
-        parts = Path(file["dst_path"]).parts
-        current = tree
-        for part in parts:
-            current = current.setdefault(part, {})
-    tree = {path: tree}
-    tr = LeftAligned(draw=BoxStyle(gfx=BOX_LIGHT, horiz_len=1))
-    print(tr(tree))
-
-    # 🔗 Match each summary by path (more robust than relying on index order)
-    summary_lookup = {item["file_path"]: item["summary"] for item in summaries}
-    for file in files:
-        file["summary"] = summary_lookup.get(file["src_path"]) or summary_lookup.get(file["file_path"], "")
+    try:
+        print(colored("🔍 Summarizing files...", "cyan"))
+        async for summary in iter_dir_summaries(path):
+            summaries.write(summary)
+
+        print(colored("🗂️ Categorizing files...", "cyan"))
+        if len(summaries):
+            for file in iter_file_tree(summaries, total=len(summaries)):
+                files.write(file)
+
+        if not len(files):
+            raise HTTPException(
+                status_code=500,
+                detail="No files were categorized. The model may have returned empty responses.",
+            )
+
+        index_categories(path, files)
+
+        print(colored("🌲 Building directory tree...\n", "cyan"))
+
+        # Aggregated directory tree preview
+        preview = FolderPreview()
+        for file in files:
+            src_file = os.path.join(path, file["src_path"])
+            preview.add(file["dst_path"], os.path.getsize(src_file) if os.path.isfile(src_file) else 0)
+        print(preview.render(path))
+    except BaseException:
+        cleanup()
+        raise
+
+    # Each plan record already carries the summary it was categorized from,
+    # so the response is streamed straight from the spill file. From here on
+    # the generator's finally owns cleanup, including on client disconnect.
+    def stream():
+        try:
+            yield "["
+            for i, file in enumerate(files):
+                yield ("," if i else "") + json.dumps(file)
+            yield "]"
+        finally:
+            cleanup()
 
-    return files
+    return StreamingResponse(stream(), media_type="application/json")
 
 
 @app.post("/watch")
@@ -104,6 +120,11 @@ async def watch(request: Request):
             status_code=400, detail="Path does not exist in filesystem"
         )
 
+    # watchdog is only needed once a watch is actually started
+    from watchdog.observers import Observer
+    from src.watch_utils import Handler
+    from src.watch_utils import create_file_tree as create_watch_file_tree
+
     response_queue = queue.Queue()
     observer = Observer()
     event_handler = Handler(path, create_watch_file_tree, response_queue)
@@ -119,6 +140,13 @@ async def watch(request: Request):
     return StreamingResponse(stream())
 
 
+@app.get("/search")
+def search(q: str, limit: int = 20, path: Optional[str] = None):
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    return get_index().search(q, limit=max(1, min(limit, 200)), path=path)
+
+
 @app.post("/commit")
 async def commit(request: CommitRequest):
     print('*' * 80)
@@ -139,15 +167,19 @@ async def commit(request: CommitRequest):
     dst_directory = os.path.dirname(dst)
     os.makedirs(dst_directory, exist_ok=True)
 
+    # shutil.move places src inside dst when dst is an existing directory
+    is_file = os.path.isfile(src)
+    final_dst = os.path.join(dst, os.path.basename(src)) if os.path.isdir(dst) else dst
+
     try:
-        if os.path.isfile(src) and os.path.isdir(dst):
-            shutil.move(src, os.path.join(dst, os.path.basename(src)))
-        else:
-            shutil.move(src, dst)
+        shutil.move(src, final_dst)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"An error occurred while moving the resource: {e}"
         )
 
+    folder = os.path.dirname(final_dst) if is_file else final_dst
+    move_summary(src, final_dst, os.path.relpath(folder, request.base_path), is_dir=not is_file)
+
     return {"message": "Commit successful"}
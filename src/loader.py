@@ -1,51 +1,128 @@
 import asyncio
 import json
+import mimetypes
 import os
 from collections import defaultdict
+from datetime import date
+from functools import lru_cache
 import random
+from typing import TYPE_CHECKING
 
 import colorama
-import ollama
-import weave
-from llama_index.core import Document, SimpleDirectoryReader
-from llama_index.core.schema import ImageDocument
-from llama_index.core.node_parser import TokenTextSplitter
 from termcolor import colored
 
+from src.search_index import index_summary
+
+# ollama and llama_index are imported where they are used: they dominate
+# startup time and plain-text files never need llama_index at all.
+if TYPE_CHECKING:
+    from llama_index.core.schema import ImageDocument
+
 colorama.init()
 
 
+SUPPORTED_EXTS = {
+    # Documents
+    ".pdf", ".txt", ".doc", ".docx", ".rtf", ".md",
+
+    # Images
+    ".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif"
+}
+
+# Read natively, without going through SimpleDirectoryReader
+PLAIN_TEXT_EXTS = {".txt", ".md"}
+
+# Roughly the 6144-token chunk the TokenTextSplitter keeps (~4 chars/token)
+MAX_TEXT_CHARS = 6144 * 4
+
+
+class TextDocument:
+    # Minimal stand-in for llama_index's Document for plain-text files
+    def __init__(self, text: str, metadata: dict):
+        self.text = text
+        self.metadata = metadata
+
+
 async def get_dir_summaries(path: str):
-    doc_dicts = load_documents(path)
-    summaries = await get_summaries(doc_dicts)
-    for summary in summaries:
-        summary["file_path"] = os.path.relpath(summary["file_path"], path)
-    return summaries
-
-
-def load_documents(path: str):
-    reader = SimpleDirectoryReader(
-        input_dir=path,
-        recursive=True,
-        required_exts = [
-            # Documents
-            ".pdf", ".txt", ".doc", ".docx", ".rtf", ".md",
-
-            # Images
-            ".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif"
-        ]
-    )
-    splitter = TokenTextSplitter(chunk_size=6144)
-    documents = []
-    for docs in reader.iter_data():
-        if len(docs) > 1:
-            for d in docs:
-                contents = splitter.split_text("\n".join(d.text))
-                text = contents[0] if contents else ""
-                documents.append(Document(text=text, metadata=docs[0].metadata))
-        else:
-            documents.append(docs[0])
-    return documents
+    return [summary async for summary in iter_dir_summaries(path)]
+
+
+async def iter_dir_summaries(path: str, on_skip=None):
+    # Yields summaries one file at a time; files that are unsupported or fail
+    # to load/summarize are reported through on_skip(relative_path) instead.
+    on_skip = on_skip or (lambda file_path: None)
+    for i, doc in enumerate(iter_documents(path, on_skip)):
+        file_path = doc.metadata["file_path"]
+        rel_path = os.path.relpath(file_path, path)
+        try:
+            print(colored(f"[{i+1}] Summarizing {rel_path}...", "cyan"))
+            summary = await dispatch_summarize_document(doc)
+        except Exception as e:
+            print(colored(f"Failed to summarize document: {e}", "red"))
+            on_skip(rel_path)
+            continue
+        index_summary(file_path, summary["summary"])
+        summary["file_path"] = rel_path
+        yield summary
+        await asyncio.sleep(random.uniform(0.1, 0.1)) # gentle delay to avoid overload
+
+
+def iter_documents(path: str, on_skip=None):
+    # Walks lazily instead of letting SimpleDirectoryReader materialize the
+    # whole tree, so only one file's contents are ever held at a time.
+    on_skip = on_skip or (lambda file_path: None)
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            rel_path = os.path.relpath(file_path, path)
+            hidden = any(part.startswith(".") for part in rel_path.split(os.sep))
+            if hidden or os.path.splitext(name)[1].lower() not in SUPPORTED_EXTS:
+                on_skip(rel_path)
+                continue
+            try:
+                yield load_document(file_path)
+            except Exception as e:
+                print(colored(f"Failed to load {rel_path}: {e}", "red"))
+                on_skip(rel_path)
+
+
+@lru_cache(maxsize=1)
+def get_splitter():
+    from llama_index.core.node_parser import TokenTextSplitter
+
+    return TokenTextSplitter(chunk_size=6144)
+
+
+def load_text_document(path: str):
+    stat = os.stat(path)
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        text = f.read(MAX_TEXT_CHARS)
+    # Same metadata keys SimpleDirectoryReader attaches by default
+    metadata = {
+        "file_path": path,
+        "file_name": os.path.basename(path),
+        "file_type": mimetypes.guess_type(path)[0],
+        "file_size": stat.st_size,
+        "creation_date": date.fromtimestamp(stat.st_ctime).isoformat(),
+        "last_modified_date": date.fromtimestamp(stat.st_mtime).isoformat(),
+    }
+    return TextDocument(text=text, metadata=metadata)
+
+
+def load_document(path: str):
+    if os.path.splitext(path)[1].lower() in PLAIN_TEXT_EXTS:
+        return load_text_document(path)
+
+    from llama_index.core import Document, SimpleDirectoryReader
+    from llama_index.core.schema import ImageDocument
+
+    docs = SimpleDirectoryReader(input_files=[path]).load_data()
+    if len(docs) == 1 and isinstance(docs[0], ImageDocument):
+        return docs[0]
+    contents = get_splitter().split_text("\n".join(d.text for d in docs))
+    text = contents[0] if contents else ""
+    return Document(text=text, metadata={**docs[0].metadata, "file_path": path})
 
 
 async def summarize_document(doc):
@@ -67,6 +144,8 @@ Respond in JSON format with this schema:
 ```
 """.strip()
 
+    import ollama
+
     client = ollama.AsyncClient()
     response = await client.chat(
         model="mistral:instruct",
@@ -88,11 +167,13 @@ Respond in JSON format with this schema:
     print("-" * 80 + "\n")
     return summary
 
-async def summarize_image_document(doc: ImageDocument):
+async def summarize_image_document(doc: "ImageDocument"):
     PROMPT = """
 What is this a picture of?
 """.strip()
 
+    import ollama
+
     client = ollama.AsyncClient()
     response = await client.chat(
         model="llava:13b",
@@ -116,6 +197,12 @@ What is this a picture of?
 
 
 async def dispatch_summarize_document(doc, _client=None):
+    if isinstance(doc, TextDocument):
+        return await summarize_document({"content": doc.text, **doc.metadata})
+
+    from llama_index.core import Document
+    from llama_index.core.schema import ImageDocument
+
     if isinstance(doc, ImageDocument):
         return await summarize_image_document(doc)
     elif isinstance(doc, Document):
@@ -123,18 +210,6 @@ async def dispatch_summarize_document(doc, _client=None):
     else:
         raise ValueError("Document type not supported")
 
-async def get_summaries(documents):
-    summaries = []
-    for i, doc in enumerate(documents):
-        try:
-            print(colored(f"[{i+1}/{len(documents)}] Summarizing...", "cyan"))
-            summary = await dispatch_summarize_document(doc)
-            summaries.append(summary)
-            await asyncio.sleep(random.uniform(0.1, 0.1)) # gentle delay to avoid overload
-        except Exception as e:
-            print(colored(f"Failed to summarize document: {e}", "red"))
-    return summaries
-
 def merge_summary_documents(summaries, metadata_list):
     list_summaries = defaultdict(list)
     for item in summaries:
@@ -155,16 +230,18 @@ def merge_summary_documents(summaries, metadata_list):
 # ===========================
 
 def get_file_summary(path: str):
-    reader = SimpleDirectoryReader(input_files=[path]).iter_data()
-    docs = next(reader)
-    splitter = TokenTextSplitter(chunk_size=6144)
-    text = splitter.split_text("\n".join([d.text for d in docs]))[0]
-    doc = Document(text=text, metadata=docs[0].metadata)
+    doc = load_document(path)
     summary = dispatch_summarize_document_sync(doc)
     return summary
 
 
 def dispatch_summarize_document_sync(doc):
+    if isinstance(doc, TextDocument):
+        return summarize_document_sync({"content": doc.text, **doc.metadata})
+
+    from llama_index.core import Document
+    from llama_index.core.schema import ImageDocument
+
     if isinstance(doc, ImageDocument):
         return summarize_image_document_sync(doc)
     elif isinstance(doc, Document):
@@ -192,6 +269,8 @@ Respond in JSON format with this schema:
 ```
 """.strip()
 
+    import ollama
+
     client = ollama.Client()
     response = client.chat(
         model="mistral:instruct",
@@ -215,7 +294,9 @@ Respond in JSON format with this schema:
     return summary
 
 
-def summarize_image_document_sync(doc: ImageDocument):
+def summarize_image_document_sync(doc: "ImageDocument"):
+    import ollama
+
     client = ollama.Client()
     response = client.chat(
         model="moondream",
@@ -0,0 +1,66 @@
+import os
+from pathlib import Path
+
+SAMPLE_SIZE = 3
+
+
+def format_size(size: int):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+class FolderPreview:
+    # Aggregates a move plan per destination folder (file count, total size
+    # and a few sample names) so the preview stays readable and its memory
+    # grows with the number of folders, not the number of files.
+    def __init__(self, samples: int = SAMPLE_SIZE):
+        self.samples = samples
+        self.folders = {}
+
+    def add(self, dst_path, size: int = 0):
+        folder, name = os.path.split(os.path.normpath(str(dst_path)))
+        stats = self.folders.setdefault(folder, {"count": 0, "size": 0, "samples": []})
+        stats["count"] += 1
+        stats["size"] += size
+        if len(stats["samples"]) < self.samples:
+            stats["samples"].append(name)
+
+    def render(self, root: str):
+        nested = {}
+        for folder in self.folders:
+            node = nested
+            for part in Path(folder).parts:
+                node = node.setdefault(part, {})
+
+        total_count = sum(stats["count"] for stats in self.folders.values())
+        total_size = sum(stats["size"] for stats in self.folders.values())
+        label = f"{root} ({total_count} files, {format_size(total_size)})"
+        tree = {label: self._labelled(nested, "")}
+
+        from asciitree import LeftAligned
+        from asciitree.drawing import BOX_LIGHT, BoxStyle
+
+        tr = LeftAligned(draw=BoxStyle(gfx=BOX_LIGHT, horiz_len=1))
+        return tr(tree)
+
+    def _labelled(self, nested, prefix):
+        children = {}
+        stats = self.folders.get(prefix)
+        if stats:
+            for name in stats["samples"]:
+                children[name] = {}
+            more = stats["count"] - len(stats["samples"])
+            if more > 0:
+                children[f"… {more} more"] = {}
+
+        for name in sorted(nested):
+            folder = os.path.join(prefix, name) if prefix else name
+            label = f"{name}/"
+            sub = self.folders.get(folder)
+            if sub:
+                label += f" ({sub['count']} files, {format_size(sub['size'])})"
+            children[label] = self._labelled(nested[name], folder)
+        return children
@@ -0,0 +1,225 @@
+import os
+import re
+import sqlite3
+import threading
+
+from termcolor import colored
+
+from src.tree_generator import VALID_FOLDERS
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".llamafs", "summaries.db")
+
+# Plain table keyed by path so upserts/deletes are index lookups; the FTS5
+# table mirrors it as external content and is kept in sync by triggers.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    category TEXT,
+    summary TEXT NOT NULL DEFAULT ''
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    summary, category, path,
+    content='files', content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, summary, category, path)
+    VALUES (new.id, new.summary, new.category, new.path);
+END;
+
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, summary, category, path)
+    VALUES ('delete', old.id, old.summary, old.category, old.path);
+END;
+
+CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, summary, category, path)
+    VALUES ('delete', old.id, old.summary, old.category, old.path);
+    INSERT INTO files_fts(rowid, summary, category, path)
+    VALUES (new.id, new.summary, new.category, new.path);
+END;
+""".strip()
+
+UPSERT_SQL = """
+INSERT INTO files (path, category, summary) VALUES (?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    summary = excluded.summary,
+    category = COALESCE(excluded.category, files.category)
+""".strip()
+
+# Ranking happens inside FTS5; bm25 weights are summary, category, path.
+SEARCH_SQL = """
+SELECT f.path, f.category, f.summary,
+       snippet(files_fts, 0, '[', ']', '…', 16),
+       files_fts.rank
+FROM files_fts
+JOIN files f ON f.id = files_fts.rowid
+WHERE files_fts MATCH ? AND files_fts.rank MATCH 'bm25(1.0, 4.0, 2.0)' {path_filter}
+ORDER BY files_fts.rank
+LIMIT ?
+""".strip()
+
+
+def to_category(folder):
+    # The category column only ever holds one of the VALID_FOLDERS, taken
+    # from the top-level folder of a (relative) path; anything else is None
+    # so an upsert keeps whatever category the file already had.
+    if not folder:
+        return None
+    top = os.path.normpath(str(folder)).split(os.sep)[0].strip().lower()
+    return top if top in VALID_FOLDERS else None
+
+
+def to_fts_query(text: str):
+    # Quote every term so user input can never hit FTS5 query syntax
+    terms = re.findall(r"\w+", text, re.UNICODE)
+    if not terms:
+        return None
+    return " ".join('"' + t + '"' for t in terms)
+
+
+class SummaryIndex:
+    def __init__(self, db_path: str = None):
+        # Resolved here rather than at import so a value from .env (loaded
+        # after the imports in main.py/server.py) is honoured
+        db_path = db_path or os.getenv("LLAMAFS_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # Shared between the watchdog observer thread and the API workers
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def upsert(self, path: str, summary: str, category: str = None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                UPSERT_SQL, (os.path.abspath(path), to_category(category), summary or "")
+            )
+
+    def set_categories(self, categories):
+        rows = ((to_category(category), os.path.abspath(path)) for path, category in categories)
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE files SET category = COALESCE(?, category) WHERE path = ?", rows
+            )
+
+    def move(self, old_path: str, new_path: str, category: str = None):
+        old_path, new_path = os.path.abspath(old_path), os.path.abspath(new_path)
+        with self.lock, self.conn:
+            # A stale row at the destination would violate the unique path
+            self.conn.execute("DELETE FROM files WHERE path = ? AND path != ?", (new_path, old_path))
+            self.conn.execute(
+                "UPDATE files SET path = ?, category = COALESCE(?, category) WHERE path = ?",
+                (new_path, to_category(category), old_path),
+            )
+
+    def move_prefix(self, old_dir: str, new_dir: str, category: str = None):
+        # Re-keys every file under a moved directory. substr() keeps the
+        # prefix test case-sensitive, unlike LIKE.
+        old_prefix = os.path.join(os.path.abspath(old_dir), "")
+        new_prefix = os.path.join(os.path.abspath(new_dir), "")
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM files WHERE substr(path, 1, length(?)) = ?"
+                " AND substr(path, 1, length(?)) != ?",
+                (new_prefix, new_prefix, old_prefix, old_prefix),
+            )
+            self.conn.execute(
+                "UPDATE files SET path = ? || substr(path, length(?) + 1),"
+                " category = COALESCE(?, category)"
+                " WHERE substr(path, 1, length(?)) = ?",
+                (new_prefix, old_prefix, to_category(category), old_prefix, old_prefix),
+            )
+
+    def remove(self, path: str):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (os.path.abspath(path),))
+
+    def search(self, text: str, limit: int = 20, path: str = None):
+        query = to_fts_query(text)
+        if query is None:
+            return []
+
+        params = [query]
+        path_filter = ""
+        if path:
+            prefix = os.path.join(os.path.abspath(path), "")
+            path_filter = "AND substr(f.path, 1, length(?)) = ?"
+            params += [prefix, prefix]
+        params.append(limit)
+
+        with self.lock:
+            rows = self.conn.execute(
+                SEARCH_SQL.format(path_filter=path_filter), params
+            ).fetchall()
+
+        return [
+            {
+                "file_path": row[0],
+                "category": row[1],
+                "summary": row[2],
+                "snippet": row[3],
+                "score": -row[4],
+            }
+            for row in rows
+        ]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SummaryIndex()
+        return _index
+
+
+def index_summary(path: str, summary: str, category: str = None):
+    # Indexing is best effort: a broken index must never fail summarization
+    try:
+        get_index().upsert(path, summary, category)
+    except Exception as e:
+        print(colored(f"⚠️ Failed to index summary for {path}: {e}", "yellow"))
+
+
+def remove_summary(path: str):
+    try:
+        get_index().remove(path)
+    except Exception as e:
+        print(colored(f"⚠️ Failed to remove {path} from index: {e}", "yellow"))
+
+
+def move_summary(old_path: str, new_path: str, category: str = None, is_dir: bool = False):
+    try:
+        if is_dir:
+            get_index().move_prefix(old_path, new_path, category)
+        else:
+            get_index().move(old_path, new_path, category)
+    except Exception as e:
+        print(colored(f"⚠️ Failed to move {old_path} in index: {e}", "yellow"))
+
+
+def index_categories(base_path: str, files: list):
+    try:
+        get_index().set_categories(
+            (
+                os.path.join(base_path, file["src_path"]),
+                os.path.dirname(file["dst_path"]) or None,
+            )
+            for file in files
+        )
+    except Exception as e:
+        print(colored(f"⚠️ Failed to index categories: {e}", "yellow"))
@@ -0,0 +1,39 @@
+import json
+import os
+
+
+class SpillFile:
+    # Append-only JSONL file of fixed-shape records. Rows are stored as compact
+    # JSON arrays (field names live here, not on every line) and read back
+    # lazily, so a pipeline stage never needs the previous stage in memory.
+    def __init__(self, path, fields):
+        self.path = path
+        self.fields = tuple(fields)
+        self.count = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, record: dict):
+        row = [record.get(field) for field in self.fields]
+        self._file.write(json.dumps(row, ensure_ascii=False, separators=(",", ":"), default=str))
+        self._file.write("\n")
+        self.count += 1
+
+    def __iter__(self):
+        self._file.flush()
+        with open(self.path, encoding="utf-8") as spill:
+            for line in spill:
+                yield dict(zip(self.fields, json.loads(line)))
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
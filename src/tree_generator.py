@@ -1,6 +1,5 @@
 import json
 import re
-import ollama
 from termcolor import colored
 import time
 import random
@@ -60,58 +59,66 @@ def validate_dst_path(dst_path, original_filename):
 def create_file_tree(summaries: list, session=None):
     if not summaries:
         raise ValueError("Summaries list is empty — cannot create file tree.")
+    return list(iter_file_tree(summaries, session=session, total=len(summaries)))
 
-    client = session or ollama.Client()
-    categorized_files = []
-    log_entries = []
 
-    for i, summary in enumerate(summaries):
-        file_path = summary["file_path"]
-        file_summary = summary["summary"]
+def iter_file_tree(summaries, session=None, total=None):
+    # Streams one categorized file at a time so callers can spill results to
+    # disk instead of holding the whole plan in memory.
+    if session is None:
+        import ollama
 
-        try:
-            print(colored(f"[{i+1}/{len(summaries)}] Categorizing {file_path}", "cyan"))
+        session = ollama.Client()
+    client = session
+    progress = f"/{total}" if total else ""
 
-            messages = [
-                {"role": "system", "content": FILE_PROMPT},
-                {"role": "user", "content": json.dumps({
-                    "src_path": file_path,
-                    "summary": file_summary
-                })},
-                {"role": "user", "content": "Respond ONLY with the JSON as described. No comments. Pure JSON."}
-            ]
-
-            response = client.chat(model="mistral:instruct", messages=messages)
-            content = response["message"]["content"]
-            print(colored(content, "yellow"))
-
-            clean_json = extract_json(content)
-            data = json.loads(clean_json)
-
-            if "files" in data:
-                for file in data["files"]:
-                    validated_dst = validate_dst_path(file["dst_path"], file["src_path"])
-                    log_entries.append(f"{file['src_path']} -> {validated_dst}")
-                    file["dst_path"] = validated_dst
-                    categorized_files.append(file)
-            else:
-                raise ValueError("Missing 'files' key")
-
-            time.sleep(random.uniform(0.3, 0.8))  # throttle gently
-
-        except Exception as e:
-            print(colored(f"❌ Error categorizing file {file_path}: {e}", "red"))
-            print(colored(f"🪵 Raw content: {response.get('message', {}).get('content', 'N/A')}", "magenta"))
-            fallback_path = os.path.join("uncategorized", os.path.basename(file_path))
-            log_entries.append(f"{file_path} -> {fallback_path}  # fallback")
-            categorized_files.append({
-                "src_path": file_path,
-                "dst_path": fallback_path
-            })
-
-    # Write log to file
     with open("categorization_log.txt", "w", encoding="utf-8") as log_file:
-        for entry in log_entries:
-            log_file.write(entry + "\n")
-
-    return categorized_files
+        for i, summary in enumerate(summaries):
+            file_path = summary["file_path"]
+            file_summary = summary["summary"]
+            response = {}
+
+            try:
+                print(colored(f"[{i+1}{progress}] Categorizing {file_path}", "cyan"))
+
+                messages = [
+                    {"role": "system", "content": FILE_PROMPT},
+                    {"role": "user", "content": json.dumps({
+                        "src_path": file_path,
+                        "summary": file_summary
+                    })},
+                    {"role": "user", "content": "Respond ONLY with the JSON as described. No comments. Pure JSON."}
+                ]
+
+                response = client.chat(model="mistral:instruct", messages=messages)
+                content = response["message"]["content"]
+                print(colored(content, "yellow"))
+
+                clean_json = extract_json(content)
+                data = json.loads(clean_json)
+
+                if "files" not in data:
+                    raise ValueError("Missing 'files' key")
+
+                categorized = []
+                for file in data["files"]:
+                    file["dst_path"] = validate_dst_path(file["dst_path"], file["src_path"])
+                    file["summary"] = file_summary
+                    categorized.append(file)
+
+                for file in categorized:
+                    log_file.write(f"{file['src_path']} -> {file['dst_path']}\n")
+                    yield file
+
+                time.sleep(random.uniform(0.3, 0.8))  # throttle gently
+
+            except Exception as e:
+                print(colored(f"❌ Error categorizing file {file_path}: {e}", "red"))
+                print(colored(f"🪵 Raw content: {response.get('message', {}).get('content', 'N/A')}", "magenta"))
+                fallback_path = os.path.join("uncategorized", os.path.basename(file_path))
+                log_file.write(f"{file_path} -> {fallback_path}  # fallback\n")
+                yield {
+                    "src_path": file_path,
+                    "dst_path": fallback_path,
+                    "summary": file_summary,
+                }
@@ -2,13 +2,20 @@ import asyncio
 import json
 import os
 import time
-import ollama
+from collections import OrderedDict, defaultdict, deque
+from itertools import islice
 
 # from groq import Groq
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
 from src.loader import get_dir_summaries, get_file_summary
+from src.search_index import index_summary, remove_summary
+from src.tree_generator import extract_json
+
+# Per-event prompt size is bounded by these, not by the size of the folder
+MAX_EXAMPLES = 5
+MAX_NEIGHBOURS = 8
 
 
 class Handler(FileSystemEventHandler):
@@ -16,22 +23,35 @@ class Handler(FileSystemEventHandler):
         self.base_path = base_path
         self.callback = callback
         self.queue = queue
-        self.events = []
+        # Most recent user moves, sent as few-shot examples
+        self.events = deque(maxlen=MAX_EXAMPLES)
+        # Summarized files per directory that have no proposal yet.
+        # OrderedDict keeps removal, reordering and taking the first few O(1).
+        self.unplanned = defaultdict(OrderedDict)
         print(f"Watching directory {base_path}")
 
     async def set_summaries(self):
         print(f"Getting summaries for {self.base_path}")
-        self.summaries = await get_dir_summaries(self.base_path)
-        self.summaries_cache = {s["file_path"]: s for s in self.summaries}
+        summaries = await get_dir_summaries(self.base_path)
+        self.summaries_cache = {s["file_path"]: s for s in summaries}
+        for file_path in self.summaries_cache:
+            self.unplanned[os.path.dirname(file_path)][file_path] = None
 
     def update_summary(self, file_path):
         print(f"Updating summary for {file_path}")
         path = os.path.join(self.base_path, file_path)
+        self.mark_planned(file_path)
         if not os.path.exists(path):
-            self.summaries_cache.pop(file_path)
+            self.summaries_cache.pop(file_path, None)
+            remove_summary(path)
             return
         self.summaries_cache[file_path] = get_file_summary(path)
-        self.summaries = list(self.summaries_cache.values())
+        self.unplanned[os.path.dirname(file_path)][file_path] = None
+        index_summary(
+            path,
+            self.summaries_cache[file_path]["summary"],
+            os.path.dirname(file_path) or None,
+        )
         self.queue.put(
             {
                 "files": [
@@ -66,24 +86,83 @@ class Handler(FileSystemEventHandler):
         src_path = os.path.relpath(event.src_path, self.base_path)
         dest_path = os.path.relpath(event.dest_path, self.base_path)
         print(f"Moved {src_path} > {dest_path}")
+        if event.is_directory:
+            return
         self.events.append({"src_path": src_path, "dst_path": dest_path})
         self.update_summary(src_path)
         self.update_summary(dest_path)
-        print("Summaries: ", self.summaries)
-        print("Events: ", self.events)
+
+        pending = self.neighbours(os.path.dirname(src_path))
+        if not pending:
+            return
+
+        print(f"Re-planning {len(pending)} file(s) next to {src_path}")
         files = self.callback(
-            summaries=self.summaries, fs_events=json.dumps(
-                {"files": self.events})
+            summaries=pending, fs_events=json.dumps({"files": list(self.events)})
         )
-
-        self.queue.put(files)
+        # Entries are matched back by path, or by basename since the model
+        # sometimes drops the directory (all neighbours share one). Anything
+        # that is not a well-formed entry is skipped rather than trusted.
+        sent = {summary["src_path"] for summary in pending}
+        by_name = {os.path.basename(file_path): file_path for file_path in sent}
+
+        proposed = []
+        for file in files if isinstance(files, list) else []:
+            if not isinstance(file, dict) or not isinstance(file.get("dst_path"), str):
+                print(f"Dropping malformed proposal {file!r}")
+                continue
+            src = file.get("src_path")
+            src = src if isinstance(src, str) else ""
+            file_path = src if src in sent else by_name.get(os.path.basename(src))
+            if file_path is None:
+                print(f"Dropping proposal for unknown file {src}")
+                continue
+            file["src_path"] = file_path
+            proposed.append(file)
+
+        # Only files that got a proposal leave the unplanned set; the rest are
+        # moved to the back so a failing reply does not starve their siblings.
+        planned = {file["src_path"] for file in proposed}
+        for file_path in planned:
+            self.mark_planned(file_path)
+        missing = sent - planned
+        if missing:
+            print(f"No proposal returned for: {', '.join(sorted(missing))}")
+            unplanned = self.unplanned[os.path.dirname(src_path)]
+            for file_path in missing:
+                if file_path in unplanned:
+                    unplanned.move_to_end(file_path)
+
+        if proposed:
+            self.queue.put(proposed)
+
+    def mark_planned(self, file_path):
+        directory = os.path.dirname(file_path)
+        files = self.unplanned.get(directory)
+        if files is not None:
+            files.pop(file_path, None)
+            if not files:
+                del self.unplanned[directory]
+
+    def neighbours(self, directory):
+        # Up to MAX_NEIGHBOURS summarized files in the directory the user just
+        # moved a file out of that have not been planned yet. Taken from the
+        # per-directory unplanned set, so the cost does not depend on how many
+        # files the directory holds.
+        files = self.unplanned.get(directory)
+        if not files:
+            return []
+        return [
+            {"src_path": file_path, "summary": self.summaries_cache[file_path]["summary"]}
+            for file_path in islice(files, MAX_NEIGHBOURS)
+        ]
 
 
 def create_file_tree(summaries, fs_events):
     FILE_PROMPT = """
-You will be provided with a single file name and a summary of its contents.
+You will be provided with a list of files, each with its path and a summary of its contents.
 
-Generate a new `dst_path` that includes:
+For each file, generate a new `dst_path` that includes:
 - A folder name that categorizes the file based on its content that must be one of the following words: anime, games, comics, cyberpunk, humor, magic-the-gathering, movies, fantasy, landscape, workspace, memes, food, music, history, fashion, philosophy, science-fiction, marvel, dc, lego, astronomy, horror, holidays, interior
 - A new filename based on the subject of the file (make it more specific)
 
@@ -108,25 +187,32 @@ Respond ONLY in the following JSON format:
 """.strip()
 
     WATCH_PROMPT = f"""
-Here are a few examples of good file naming conventions to emulate, based on the files provided:
+Here are the most recent moves the user made by hand. Emulate their folder and naming conventions:
 
 ```json
 {fs_events}
 ```
 
-Include the above items in your response exactly as is, along all other proposed changes.
+Only propose changes for the files provided, not for the examples above.
 """.strip()
 
+    import ollama
+
     client = ollama.Client()
     try:
         response = client.chat(
             model="mistral:instruct",
             messages=[
                 {"role": "system", "content": FILE_PROMPT},
+                {"role": "system", "content": WATCH_PROMPT},
                 {"role": "user", "content": json.dumps(summaries)},
             ]
         )
-        return json.loads(response["message"]["content"])["files"]
+        data = json.loads(extract_json(response["message"]["content"]))
+        files = data.get("files") if isinstance(data, dict) else None
+        if not isinstance(files, list):
+            raise ValueError("Missing 'files' list")
+        return files
     except Exception as e:
         print(f"❌ Failed to generate file tree with Ollama: {e}")
         return []